@@ -17,6 +17,8 @@
 #
 
 import argparse
+import concurrent.futures
+import hashlib
 import os
 import shutil
 import subprocess
@@ -38,14 +40,29 @@ from .utility import (
 )
 
 
+def _build_target(args: list, target: str, jobs: str):
+    Builder(args, target=target, jobs=jobs, prepare_prefix=False).run()
+
+
 class Builder(object):
-    def __init__(self, args: list):
+    def __init__(self, args: list, target: typing.Optional[str] = None,
+                 jobs: typing.Optional[str] = None, prepare_prefix: bool = True):
         self._targets = CaseInsensitiveDict({target.name: target for target in targets()})
+        self._argv = list(args)
+        self._prepare_prefix = prepare_prefix
 
         arguments = self._parse_arguments(args)
 
+        if target:
+            # Worker process of a parallel multi-target build handles exactly one target
+            arguments.target = [target]
+            arguments.jobs = jobs
+
+        self._target_names: typing.List[str] = arguments.target or []
+
         state = self._state = BuildState()
         state.xcode = arguments.xcode
+        state.ninja = arguments.ninja
         state.verbose = arguments.verbose
 
         self._platforms: typing.List[TargetPlatform] = []
@@ -63,7 +80,7 @@ class Builder(object):
             state.source_path = Path(arguments.source_path).absolute()
 
         if arguments.target:
-            self._target = self._targets[arguments.target]
+            self._target = self._targets[arguments.target[0]]
             state.source = state.source_path / self._target.name
             state.external_source = False
 
@@ -74,9 +91,12 @@ class Builder(object):
             state.external_source = True
             self._detect_target()
 
-        for target in self._targets.values():
-            if target != self._target:
-                target.initialize(state)
+        if prepare_prefix:
+            # Initialization may write into deps, e.g. MoltenVK dylib creation,
+            # so workers of a parallel build rely on the parent having done it before spawning
+            for target in self._targets.values():
+                if target != self._target:
+                    target.initialize(state)
 
         del self._targets
 
@@ -90,16 +110,18 @@ class Builder(object):
         else:
             state.output_path = state.root_path / 'output'
 
+        if arguments.prefix_cache_path:
+            state.prefix_cache_path = Path(arguments.prefix_cache_path).absolute()
+
         self._environment = state.environment
 
         state.static_moltenvk = arguments.static_moltenvk
         state.quasi_glib = arguments.quasi_glib
         state.jobs = arguments.jobs and arguments.jobs or self._get_default_job_count()
 
-    def _get_default_job_count(self):
-        args = ('sysctl', '-n', 'hw.ncpu')
-        result = subprocess.run(args, check=True, env=self._environment, stdout=subprocess.PIPE)
-        return result.stdout.decode('ascii').strip()
+    @staticmethod
+    def _get_default_job_count():
+        return str(os.cpu_count() or 1)
 
     def _populate_platforms(self, arguments):
         state = self._state
@@ -139,6 +161,10 @@ class Builder(object):
                 break
 
     def run(self):
+        if len(self._target_names) > 1:
+            self._run_parallel_targets()
+            return
+
         state = self._state
         target = self._target
         target.prepare_source(state)
@@ -153,7 +179,8 @@ class Builder(object):
         if not state.xcode and state.install_path.exists():
             shutil.rmtree(state.install_path)
 
-        self._create_prefix_directory()
+        if self._prepare_prefix:
+            self._create_prefix_directory()
 
         if version := state.source_version():
             action = 'Generating' if state.xcode else 'Building'
@@ -164,6 +191,23 @@ class Builder(object):
         else:
             self._build(target)
 
+    def _run_parallel_targets(self):
+        assert not self._state.xcode
+
+        # Target builds use disjoint source and build directories; the shared pieces,
+        # target initialization writing into deps and prefix assembly, are done once
+        # here and in the constructor before workers are spawned
+        self._create_prefix_directory()
+
+        target_names = self._target_names
+        jobs = str(max(1, int(self._state.jobs) // len(target_names)))
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(target_names)) as executor:
+            futures = [executor.submit(_build_target, self._argv, name, jobs) for name in target_names]
+
+            for future in futures:
+                future.result()
+
     def _build(self, target: Target):
         state = self._state
         state.environment = self._environment.copy()
@@ -288,18 +332,89 @@ class Builder(object):
 
     def _create_prefix_directory(self):
         state = self._state
-        os.makedirs(state.prefix_path, exist_ok=True)
+        prefix_path = state.prefix_path
+
+        if prefix_path.is_symlink():
+            # Remove link to cache entry left by a previous run,
+            # population must never write through it into the cache
+            prefix_path.unlink()
+
+        if state.prefix_cache_path:
+            if prefix_path.exists():
+                shutil.rmtree(prefix_path)
 
-        cleanup = True
+            cached_prefix_path = state.prefix_cache_path / self._hash_deps_directory() / 'prefix'
 
-        for dep in state.deps_path.iterdir():
+            if not cached_prefix_path.exists():
+                # Assemble into a temporary directory published by an atomic rename,
+                # so an interrupted run cannot leave a partial entry that later runs treat as complete
+                temp_prefix_path = cached_prefix_path.with_name(cached_prefix_path.name + '.tmp')
+
+                if temp_prefix_path.exists():
+                    shutil.rmtree(temp_prefix_path)
+
+                os.makedirs(temp_prefix_path)
+                self._populate_prefix_directory(temp_prefix_path)
+
+                try:
+                    os.rename(temp_prefix_path, cached_prefix_path)
+                except OSError:
+                    # Concurrent run completed the same entry first
+                    shutil.rmtree(temp_prefix_path)
+
+            # Prefix assembled for the same deps content is reused as a whole via one symbolic link
+            os.symlink(cached_prefix_path, prefix_path)
+            return
+
+        os.makedirs(prefix_path, exist_ok=True)
+        self._populate_prefix_directory(prefix_path)
+
+    def _populate_prefix_directory(self, prefix_path: Path):
+        self._cleanup_prefix_directory(prefix_path)
+
+        for dep in self._state.deps_path.iterdir():
             if dep.is_dir():
-                symlink_directory(dep, state.prefix_path, cleanup)
+                # Hard links spare downstream tools a readlink per file open
+                symlink_directory(dep, prefix_path, cleanup=False, hard_links=True)
+
+        Builder._remove_empty_directories(prefix_path)
+
+    def _cleanup_prefix_directory(self, prefix_path: Path):
+        # A hard link to a file deleted from deps stays a valid regular file,
+        # so stale entries are detected by inodes no longer present in the deps tree
+        deps_inodes = set()
+
+        for root, _, files in os.walk(self._state.deps_path):
+            for filename in files:
+                file_stat = os.lstat(Path(root) / filename)
+                deps_inodes.add((file_stat.st_dev, file_stat.st_ino))
+
+        for root, _, files in os.walk(prefix_path):
+            for filename in files:
+                file_path = Path(root) / filename
+
+                if file_path.is_symlink():
+                    if not file_path.exists():
+                        os.remove(file_path)
+                else:
+                    file_stat = file_path.stat()
+
+                    if (file_stat.st_dev, file_stat.st_ino) not in deps_inodes:
+                        os.remove(file_path)
+
+    def _hash_deps_directory(self) -> str:
+        deps_path = self._state.deps_path
+        hasher = hashlib.blake2b()
+
+        for root, dirs, files in os.walk(deps_path):
+            dirs.sort()
+            relative_root = Path(root).relative_to(deps_path)
 
-                # Do symlink cleanup only once
-                cleanup = False
+            for filename in sorted(files):
+                file_stat = os.stat(Path(root) / filename)
+                hasher.update(f'{relative_root / filename}:{file_stat.st_size}:{file_stat.st_mtime_ns}'.encode())
 
-        Builder._remove_empty_directories(state.prefix_path)
+        return hasher.hexdigest()
 
     @staticmethod
     def _remove_empty_directories(path: Path) -> int:
@@ -333,11 +448,12 @@ class Builder(object):
         parser = argparse.ArgumentParser(description='*ZDoom binary dependencies for macOS')
 
         excl_group = parser.add_mutually_exclusive_group(required=True)
-        excl_group.add_argument('--target', choices=self._targets.keys(), help='target to build')
+        excl_group.add_argument('--target', nargs='+', choices=self._targets.keys(), help='targets to build')
         excl_group.add_argument('--source', metavar='path', help='path to target\'s source code')
 
         group = parser.add_argument_group('Configuration options')
         group.add_argument('--xcode', action='store_true', help='generate Xcode project instead of build')
+        group.add_argument('--ninja', action='store_true', help='build CMake targets with Ninja instead of GNU Make')
         group.add_argument('--os-version-x64', metavar='version', help='macOS deployment version for x86_64')
         group.add_argument('--os-version-arm', metavar='version', help='macOS deployment version for ARM64')
         group.add_argument('--verbose', action='store_true', help='enable verbose build output')
@@ -353,6 +469,8 @@ class Builder(object):
         group.add_argument('--build-path', metavar='path', help='target build path')
         group.add_argument('--output-path', metavar='path', help='output path for main targets')
         group.add_argument('--temp-path', metavar='path', help='path to temporary files directory')
+        group.add_argument('--prefix-cache-path', metavar='path',
+                           help='path to cache of assembled prefix directories, useful for CI')
         group.add_argument('--sdk-path-x64', metavar='path', help='path to macOS SDK for x86_64')
         group.add_argument('--sdk-path-arm', metavar='path', help='path to macOS SDK for ARM64')
 
@@ -30,6 +30,8 @@ from .utility import CommandLineOptions
 
 
 class BuildState:
+    _git_version: typing.Optional[StrictVersion] = None
+
     def __init__(self):
         self_path = Path(__file__)
         self.root_path = self_path.parent.parent
@@ -50,12 +52,14 @@ class BuildState:
 
         self.output_path = None
         self.install_path = None
+        self.prefix_cache_path = None
 
         self._compiler_flags = None
         self._linker_flags = None
 
         self.platform = None
         self.xcode = False
+        self.ninja = False
         self.verbose = False
         self.jobs = 1
 
@@ -121,16 +125,37 @@ class BuildState:
 
         return self._linker_flags
 
+    def git_version(self) -> StrictVersion:
+        if not BuildState._git_version:
+            version_output = subprocess.run(('git', '--version'), check=True, env=self.environment,
+                                            stdout=subprocess.PIPE)
+            version_match = re.search(r'(\d+\.\d+(\.\d+)?)', version_output.stdout.decode('ascii'))
+            BuildState._git_version = StrictVersion(version_match.group(1)) if version_match else StrictVersion('0')
+
+        return BuildState._git_version
+
     def checkout_git(self, url: str, branch: typing.Optional[str] = None):
         if self.source.exists():
             return
 
-        args = ('git', 'clone', '--recurse-submodules', url, self.source)
-        subprocess.run(args, check=True, cwd=self.root_path, env=self.environment)
+        args = ['git', '-C', self.root_path, 'clone', '--recurse-submodules', url, self.source]
+
+        # Single-branch partial clone skips download of historic blobs that build doesn't need
+        # while keeping history and tags so that git describe still reports a proper version
+        # Partial clone requires Git 2.19 or newer
+        partial = self.git_version() >= StrictVersion('2.19')
+
+        if partial:
+            args += ['--filter=blob:none', '--single-branch']
+
+            if branch:
+                args.append('--branch=' + branch)
+
+        subprocess.run(args, check=True, env=self.environment)
 
-        if branch:
-            args = ('git', 'checkout', '-b', branch, 'origin/' + branch)
-            subprocess.run(args, check=True, cwd=self.source, env=self.environment)
+        if branch and not partial:
+            args = ['git', '-C', self.source, 'checkout', '-b', branch, 'origin/' + branch]
+            subprocess.run(args, check=True, env=self.environment)
 
     def download_source(self, url: str, checksum: str, patches: typing.Union[tuple, list, str, None] = None):
         if self.external_source:
@@ -17,6 +17,7 @@
 #
 
 import collections.abc
+import concurrent.futures
 import os
 import shutil
 import typing
@@ -75,7 +76,47 @@ class TargetPlatform:
         self.cxx_compiler = prefix_path / f'bin/{host}-g++'
 
 
-def symlink_directory(src_path: Path, dst_path: Path, cleanup=True):
+def _collect_symlinks(src_path: Path, dst_path: Path, entries: typing.List[typing.Tuple[Path, Path]]):
+    for entry in src_path.iterdir():
+        dst_subpath = dst_path / entry.name
+        if entry.is_dir():
+            os.makedirs(dst_subpath, exist_ok=True)
+            _collect_symlinks(entry, dst_subpath, entries)
+        else:
+            entries.append((entry, dst_subpath))
+
+
+def _create_hard_link(src_path: Path, dst_path: Path):
+    try:
+        os.link(src_path, dst_path)
+    except FileExistsError:
+        try:
+            if dst_path.samefile(src_path):
+                return
+        except FileNotFoundError:
+            pass
+
+        # Refresh stale link left from a previous run
+        os.remove(dst_path)
+        os.link(src_path, dst_path)
+    except OSError:
+        # Fall back to symbolic link, e.g. when crossing file system boundary
+        os.symlink(src_path, dst_path)
+
+
+def _create_link(src_path: Path, dst_path: Path, hard_links=False):
+    try:
+        if src_path.is_symlink():
+            shutil.copy(src_path, dst_path, follow_symlinks=False)
+        elif hard_links:
+            _create_hard_link(src_path, dst_path)
+        else:
+            os.symlink(src_path, dst_path)
+    except (FileExistsError, shutil.SameFileError):
+        pass
+
+
+def symlink_directory(src_path: Path, dst_path: Path, cleanup=True, hard_links=False):
     if cleanup:
         # Delete obsolete symbolic links
         for root, _, files in os.walk(dst_path, followlinks=True):
@@ -85,17 +126,17 @@ def symlink_directory(src_path: Path, dst_path: Path, cleanup=True):
                 if file_path.is_symlink() and not file_path.exists():
                     os.remove(file_path)
 
-    # Create symbolic links if needed
-    for entry in src_path.iterdir():
-        dst_subpath = dst_path / entry.name
-        if entry.is_dir():
-            os.makedirs(dst_subpath, exist_ok=True)
-            symlink_directory(entry, dst_subpath, cleanup=False)
-        elif not dst_subpath.exists():
-            if entry.is_symlink():
-                shutil.copy(entry, dst_subpath, follow_symlinks=False)
-            else:
-                os.symlink(entry, dst_subpath)
+    # Create links if needed, in parallel as this is bound by syscall latency rather than CPU
+    entries: typing.List[typing.Tuple[Path, Path]] = []
+    _collect_symlinks(src_path, dst_path, entries)
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_create_link, entry, dst_subpath, hard_links) for entry, dst_subpath in entries]
+
+        for future in futures:
+            future.result()
 
 
 # Case insensitive dictionary class from